@@ -1,5 +1,9 @@
 import re
 
+_DIRECT_ANSWER_RE = re.compile(r"\b(is|are|means|refers to)\b")
+_LIST_MARKER_RE = re.compile(r"•|- |\d+\.")
+_FRESHNESS_RE = re.compile(r"\b(2024|2025|updated|last updated)\b")
+
 
 def ai_readiness_analysis(parsed: dict) -> dict:
     """
@@ -17,7 +21,7 @@ def ai_readiness_analysis(parsed: dict) -> dict:
     gaps = []
 
     # --- Direct answer signal ---
-    if re.search(r"\b(is|are|means|refers to)\b", text[:1200]):
+    if _DIRECT_ANSWER_RE.search(text[:1200]):
         strengths.append("Has a direct-answer style introduction")
     else:
         gaps.append("Add a clear 2–3 sentence definition near the top")
@@ -29,7 +33,7 @@ def ai_readiness_analysis(parsed: dict) -> dict:
         gaps.append("Add FAQ or question-based headings")
 
     # --- Scannability ---
-    if re.search(r"•|- |\d+\.", text):
+    if _LIST_MARKER_RE.search(text):
         strengths.append("Uses lists or bullet points")
     else:
         gaps.append("Add bullet points or numbered lists")
@@ -55,7 +59,7 @@ def ai_readiness_analysis(parsed: dict) -> dict:
         gaps.append("Increase content depth (1000+ words recommended)")
 
     # --- Freshness / trust ---
-    if re.search(r"\b(2024|2025|updated|last updated)\b", text):
+    if _FRESHNESS_RE.search(text):
         strengths.append("Shows freshness or update signal")
     else:
         gaps.append("Add a visible 'last updated' date")
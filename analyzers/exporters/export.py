@@ -1,14 +1,49 @@
-import json
-from io import BytesIO
-import pandas as pd
+import csv
+import math
+import os
+from io import BytesIO, TextIOWrapper
+import orjson
+import xlsxwriter
+
+
+def _sheet_columns(rows: list[dict]) -> list:
+    # same column order pd.DataFrame(rows) would give: keys in first-seen order
+    return list(dict.fromkeys(k for row in rows for k in row))
 
 
 def export_csv(data: list[dict]) -> bytes:
     """
     Export a list of dicts to CSV bytes
     """
-    df = pd.DataFrame(data)
-    return df.to_csv(index=False).encode("utf-8")
+    # plain csv module: same layout as DataFrame.to_csv(index=False) without building a frame
+    columns = _sheet_columns(data)
+    output = BytesIO()
+    # encode straight into the byte buffer: no intermediate str copy of the whole file
+    with TextIOWrapper(output, encoding="utf-8", newline="", write_through=True) as text:
+        writer = csv.writer(text, lineterminator=os.linesep)
+        writer.writerow(columns)
+        writer.writerows([_csv_value(row.get(k)) for k in columns] for row in data)
+        return output.getvalue()
+
+
+def _csv_value(value):
+    # missing / None / NaN -> empty field, as pandas writes them
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return value
+
+
+def _sheet_name(name, used: set) -> str:
+    # Excel caps names at 31 chars and compares them case-insensitively;
+    # names that clash once truncated get a " (2)", " (3)", ... suffix
+    base = str(name)[:31]
+    candidate, n = base, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
 
 
 def export_excel(sheets: dict[str, list[dict]]) -> bytes:
@@ -17,10 +52,32 @@ def export_excel(sheets: dict[str, list[dict]]) -> bytes:
     sheets = { "Sheet name": [ {row}, {row} ] }
     """
     output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        for sheet_name, rows in sheets.items():
-            df = pd.DataFrame(rows)
-            df.to_excel(writer, index=False, sheet_name=sheet_name[:31])
+    # constant_memory flushes each row to a temp file once the next one starts -> rows must be
+    # written in order; xlsxwriter turns it off again if "in_memory" is set, so that stays unset
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    header_fmt = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+    used_names = set()
+    for sheet_name, rows in sheets.items():
+        ws = workbook.add_worksheet(_sheet_name(sheet_name, used_names))
+        columns = _sheet_columns(rows)
+        if not columns:
+            continue
+        ws.write_row(0, 0, [str(c) for c in columns], header_fmt)
+        for r, row in enumerate(rows, start=1):
+            for c, key in enumerate(columns):
+                value = row.get(key)
+                if value is None or (isinstance(value, float) and value != value):
+                    continue  # missing / NaN -> empty cell, as pandas writes it
+                if isinstance(value, bool):
+                    ws.write_boolean(r, c, value)
+                elif isinstance(value, float) and math.isinf(value):
+                    ws.write_string(r, c, "inf" if value > 0 else "-inf")  # pandas' default inf_rep
+                elif isinstance(value, (int, float)):
+                    ws.write_number(r, c, value)
+                else:
+                    # scraped text is always written as text, never as a formula or link
+                    ws.write_string(r, c, str(value))
+    workbook.close()
     return output.getvalue()
 
 
@@ -28,4 +85,8 @@ def export_json(payload: dict) -> bytes:
     """
     Export raw results as JSON bytes
     """
-    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    # built in C; for the str/int/bool/list/dict payloads the app produces this matches
+    # json.dumps(ensure_ascii=False, indent=2).encode("utf-8"). It is not a drop-in for every
+    # input: NaN/inf become null, floats use shortest repr (1e16, not 1e+16), and ints
+    # beyond 64 bits raise TypeError.
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
@@ -1,4 +1,9 @@
+import threading
+import time
+from typing import Dict, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
 
 
 HEADERS = {
@@ -11,6 +16,23 @@ HEADERS = {
     "Connection": "keep-alive",
 }
 
+# connections kept open per host by the shared session
+_POOL_SIZE = 16
+
+# One pooled session for every fetch: keep-alive skips a TCP/TLS handshake per same-host URL,
+# and the pool is sized so concurrent callers rarely wait for a connection
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE))
+
+# Successful fetches keyed by URL, reused across Streamlit reruns (oldest entry evicted first)
+_FETCH_CACHE: Dict[str, Tuple[float, dict]] = {}
+_FETCH_CACHE_MAX = 128
+FETCH_CACHE_TTL_SECONDS = 3600
+# fetch_html is called from several threads at once; eviction must not race
+_FETCH_CACHE_LOCK = threading.Lock()
+
 
 def fetch_html(url: str, timeout: int = 20) -> dict:
     """
@@ -27,10 +49,25 @@ def fetch_html(url: str, timeout: int = 20) -> dict:
     if not url:
         return {"ok": False, "html": "", "status": None, "error": "Empty URL", "final_url": ""}
 
+    with _FETCH_CACHE_LOCK:
+        cached = _FETCH_CACHE.get(url)
+    if cached is not None and time.monotonic() - cached[0] < FETCH_CACHE_TTL_SECONDS:
+        return dict(cached[1])
+
+    result = _fetch_uncached(url, timeout)
+    if result["ok"]:
+        # only successes are kept -> a timeout or 5xx is retried on the next run
+        with _FETCH_CACHE_LOCK:
+            if len(_FETCH_CACHE) >= _FETCH_CACHE_MAX:
+                _FETCH_CACHE.pop(next(iter(_FETCH_CACHE)), None)
+            _FETCH_CACHE[url] = (time.monotonic(), dict(result))
+    return result
+
+
+def _fetch_uncached(url: str, timeout: int) -> dict:
     try:
-        resp = requests.get(
+        resp = _SESSION.get(
             url,
-            headers=HEADERS,
             timeout=timeout,
             allow_redirects=True,
         )
@@ -58,3 +95,4 @@ def fetch_html(url: str, timeout: int = 20) -> dict:
         return {"ok": False, "html": "", "status": None, "error": "Timeout", "final_url": url}
     except Exception as e:
         return {"ok": False, "html": "", "status": None, "error": str(e), "final_url": url}
+
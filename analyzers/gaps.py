@@ -1,11 +1,20 @@
+import copy
 import re
-import json
 import time
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
 from typing import List, Dict, Any, Tuple
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from lxml import etree
+
+from analyzers.fetcher import FETCH_CACHE_TTL_SECONDS
+from analyzers.parser import parse_document
 
 
 HEADERS = {
@@ -13,6 +22,48 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+# One pooled session for all gap-analysis fetches (keep-alive across same-host URLs)
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=2))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=2))
+
+# Article content sits well within the first MB; bloated pages are cut here
+MAX_HTML_BYTES = 1_000_000
+
+# Minimum gap between two requests to the same host (different hosts run in parallel)
+HOST_DELAY_SECONDS = 0.35
+_HOST_LOCKS: Dict[str, threading.Lock] = {}
+_HOST_LAST_FETCH: Dict[str, float] = {}
+_HOST_LOCKS_GUARD = threading.Lock()
+
+# Competitors analysed per article; app.py caps its list at the same number
+MAX_COMPETITORS = 5
+
+# Parsed pages keyed by normalized URL, stored as (parsed_at, page) (oldest entry evicted first).
+# Entries expire with the fetcher's cache, so an edited page is picked up on a later run.
+_PAGE_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_PAGE_CACHE_MAX = 256
+
+# analyze_article results keyed by normalized (bayut_url, competitor urls), stored as
+# (computed_at, result); same expiry as the page cache, oldest entry evicted first
+_RESULT_CACHE: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, Dict[str, Any]]] = {}
+_RESULT_CACHE_MAX = 32
+# guards both caches: pages are parsed on pool threads and Streamlit runs sessions on separate threads
+_CACHE_LOCK = threading.Lock()
+
+# Subtrees never read for text or headings
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "nav", "footer", "header", "aside", "form"})
+_HEADING_TAGS = ("h1", "h2", "h3", "h4")
+
+# Evaluated in C by libxml2; the tree is never mutated
+_NOT_SKIPPED = "not(" + " or ".join(f"ancestor::{t}" for t in sorted(_SKIP_TAGS)) + ")"
+_VISIBLE_TEXT_XPATH = etree.XPath(f".//text()[{_NOT_SKIPPED} and not(ancestor::template)]", smart_strings=False)
+_HEADINGS_XPATH = etree.XPath(
+    "//*[" + " or ".join(f"self::{t}" for t in _HEADING_TAGS) + f"][{_NOT_SKIPPED}]"
+)
+_LDJSON_XPATH = etree.XPath('//script[@type="application/ld+json"]')
+
 # Headings/blocks that must never become rows
 JUNK_HEADING_PATTERNS = [
     r"looking to buy", r"looking to rent", r"subscribe", r"newsletter",
@@ -27,70 +78,94 @@ DUBAI_AREAS = [
     "Arabian Ranches", "Deira", "Dubai Creek Harbour", "Business Bay"
 ]
 
+# "Business Bay" is the article's own area -> never offered as a comparison
+_AREA_PATTERNS = [
+    (a, a.lower(), re.compile(r"\b" + re.escape(a.lower()) + r"\b"))
+    for a in dict.fromkeys(DUBAI_AREAS)
+    if a != "Business Bay"
+]
+
 
 # =====================================================
 # Utilities
 # =====================================================
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+
+
 def _clean(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "")).strip()
+    # C-level split/join; same whitespace set as \s, no regex engine per call
+    return " ".join((s or "").split())
 
 
 def _norm(s: str) -> str:
-    return re.sub(r"[^a-z0-9\s]", "", _clean(s).lower())
+    return _NON_ALNUM_RE.sub("", _clean(s).lower())
 
 
-def _is_junk_heading(h: str) -> bool:
-    t = (h or "").lower()
-    return any(re.search(p, t) for p in JUNK_HEADING_PATTERNS)
+def _any_of(*patterns: str) -> "re.Pattern[str]":
+    # one alternation per rule -> a single regex search over the joined headings
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
 
 
-def _competitor_label(url: str) -> str:
-    host = urlparse(url).netloc.lower().replace("www.", "")
-    if "drivenproperties" in host:
-        return "Driven Properties"
-    if "propertyfinder" in host:
-        return "Property Finder"
-    if "bayut" in host:
-        return "Bayut"
-    if "dubizzle" in host:
-        return "Dubizzle"
-    return host.split(":")[0] if host else "Competitor"
+_JUNK_HEADING_RE = _any_of(*JUNK_HEADING_PATTERNS)
 
 
-def _fetch_html(url: str) -> str:
-    r = requests.get(url, headers=HEADERS, timeout=25)
-    r.raise_for_status()
-    return r.text
+def _is_junk_heading(h: str) -> bool:
+    return bool(_JUNK_HEADING_RE.search((h or "").lower()))
 
 
-def _parse_page(url: str) -> Dict[str, Any]:
-    html = _fetch_html(url)
-    soup = BeautifulSoup(html, "html.parser")
+# host substring -> display label, checked in order
+_KNOWN_HOSTS = (
+    ("drivenproperties", "Driven Properties"),
+    ("propertyfinder", "Property Finder"),
+    ("bayut", "Bayut"),
+    ("dubizzle", "Dubizzle"),
+)
 
-    # remove obvious noise blocks
-    for bad in soup.find_all(["script", "style", "noscript", "nav", "footer", "header", "aside", "form"]):
-        bad.decompose()
 
-    headings = []
-    for tag in ["h1", "h2", "h3", "h4"]:
-        for el in soup.find_all(tag):
-            t = _clean(el.get_text(" ", strip=True))
-            if not t:
-                continue
-            if _is_junk_heading(t):
-                continue
-            headings.append(t)
+@lru_cache(maxsize=512)
+def _competitor_label(url: str) -> str:
+    host = urlparse(url).netloc.lower().replace("www.", "")
+    for needle, label in _KNOWN_HOSTS:
+        if needle in host:
+            return label
+    return host.split(":")[0] if host else "Competitor"
+
+
+def _throttle_host(url: str) -> None:
+    host = urlparse(url).netloc.lower()
+    with _HOST_LOCKS_GUARD:
+        lock = _HOST_LOCKS.setdefault(host, threading.Lock())
+    with lock:
+        wait = _HOST_LAST_FETCH.get(host, 0.0) + HOST_DELAY_SECONDS - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _HOST_LAST_FETCH[host] = time.monotonic()
 
-    full_text = _clean(soup.get_text(" ", strip=True))
 
-    # JSON-LD FAQ questions (if available)
+def _fetch_html(url: str) -> str:
+    _throttle_host(url)
+    with _SESSION.get(url, timeout=25, stream=True) as r:
+        r.raise_for_status()
+        chunks = []
+        total = 0
+        for c in r.iter_content(65536):
+            chunks.append(c)
+            total += len(c)
+            if total >= MAX_HTML_BYTES:
+                break
+        return b"".join(chunks)[:MAX_HTML_BYTES].decode(r.encoding or "utf-8", errors="replace")
+
+
+def _extract_jsonld_faq_questions(root) -> List[str]:
     faq_qs = []
-    for sc in soup.find_all("script", attrs={"type": "application/ld+json"}):
-        raw = (sc.string or "").strip()
-        if not raw:
+    seen = set()
+    for sc in _LDJSON_XPATH(root):
+        raw = (sc.text or "").strip()
+        # only FAQPage blocks contribute; don't decode breadcrumb / item-list blobs
+        if not raw or "FAQPage" not in raw:
             continue
         try:
-            data = json.loads(raw)
+            data = orjson.loads(raw)
         except Exception:
             continue
 
@@ -110,41 +185,146 @@ def _parse_page(url: str) -> Dict[str, Any]:
                     for ent in ents:
                         if isinstance(ent, dict):
                             q = _clean(str(ent.get("name", "")))
-                            if q and q not in faq_qs:
+                            if q and q not in seen:
+                                seen.add(q)
                                 faq_qs.append(q)
+    return faq_qs
+
+
+def _visible_text(el) -> str:
+    return " ".join(t for t in (x.strip() for x in _VISIBLE_TEXT_XPATH(el)) if t)
+
+
+def _parse_html_page(url: str, html: str) -> Dict[str, Any]:
+    # empty body: same page dict a blank document would produce, without parsing one
+    if not html or html.isspace():
+        return {
+            "url": url,
+            "source": _competitor_label(url),
+            "headings": [],
+            "headings_lower": "",
+            "text_lower": "",
+            "question_marks": 0,
+            "keyword_counts": Counter(),
+            "faq_questions": [],
+        }
+
+    root = parse_document(html)
+
+    # JSON-LD FAQ questions (if available) -> <script> blocks are skipped by the text XPath below.
+    # Screen the raw HTML first: no "FAQPage" anywhere means no script walk / JSON decoding at all.
+    faq_qs = _extract_jsonld_faq_questions(root) if "FAQPage" in html else []
+
+    # one document walk for every heading level; rows still list all h1s, then h2s, ...
+    by_tag = {t: [] for t in _HEADING_TAGS}
+    for el in _HEADINGS_XPATH(root):
+        by_tag[el.tag].append(el)
+
+    headings = []
+    for tag in _HEADING_TAGS:
+        for el in by_tag[tag]:
+            t = _clean(_visible_text(el))
+            if not t:
+                continue
+            if _is_junk_heading(t):
+                continue
+            headings.append(t)
+
+    # only the lowercased text is kept on the cached page; the original casing is never read
+    text_lower = _clean(_visible_text(root)).lower()
 
     return {
         "url": url,
         "source": _competitor_label(url),
         "headings": headings,
-        "text": full_text,
+        # lowercased and joined once here; every heading rule is a single search over this
+        "headings_lower": "\n".join(headings).lower(),
+        "text_lower": text_lower,
+        "question_marks": text_lower.count("?"),
+        # one scan per page; every rule's keyword count is read from here
+        "keyword_counts": Counter(_KEYWORD_SCAN_RE.findall(text_lower)),
         "faq_questions": faq_qs,
     }
 
 
-def _count_keywords(text: str, keywords: List[str]) -> int:
-    t = text.lower()
-    return sum(len(re.findall(r"\b" + re.escape(k) + r"\b", t)) for k in keywords)
+def _page_key(url: str) -> str:
+    p = urlparse((url or "").strip())
+    return p._replace(scheme=p.scheme.lower(), netloc=p.netloc.lower(), fragment="").geturl()
 
 
-def _has_heading_like(headings: List[str], patterns: List[str]) -> bool:
-    for h in headings:
-        hl = h.lower()
-        for p in patterns:
-            if re.search(p, hl):
-                return True
-    return False
+def _parse_page(url: str) -> Dict[str, Any]:
+    key = _page_key(url)
+    with _CACHE_LOCK:
+        cached = _PAGE_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < FETCH_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    # fetched and parsed outside the lock; only the cache update is serialized
+    page = _parse_html_page(url, _fetch_html(url))
+    with _CACHE_LOCK:
+        # an expired entry is dropped first so the refreshed page moves to the back of the eviction order
+        _PAGE_CACHE.pop(key, None)
+        if len(_PAGE_CACHE) >= _PAGE_CACHE_MAX:
+            _PAGE_CACHE.pop(next(iter(_PAGE_CACHE)), None)
+        _PAGE_CACHE[key] = (time.monotonic(), page)
+    return page
+
 
+def _count_keywords(page: Dict[str, Any], keywords: Tuple[str, ...]) -> int:
+    counts = page["keyword_counts"]
+    return sum(counts[k] for k in keywords)
 
-def _extract_area_mentions(text: str) -> List[str]:
+
+def _has_heading_like(headings_lower: str, pattern: "re.Pattern[str]") -> bool:
+    # headings are newline-joined and never contain "\n" themselves (_clean collapses it);
+    # no rule pattern matches across "\n", so one search covers every heading
+    return pattern.search(headings_lower) is not None
+
+
+@lru_cache(maxsize=64)
+def _extract_area_mentions(text_lower: str) -> Tuple[str, ...]:
+    # cached: the same competitor text is scanned by the comparison check and the row description
     found = []
-    for a in DUBAI_AREAS:
-        if re.search(r"\b" + re.escape(a) + r"\b", text, flags=re.I):
-            if a not in found:
-                found.append(a)
-    # remove "Business Bay" from the list if present (comparison should show others)
-    found = [x for x in found if _norm(x) != _norm("Business Bay")]
-    return found[:3]
+    for a, needle, pat in _AREA_PATTERNS:
+        # C-level substring scan first; the bounded regex only confirms real hits
+        if needle in text_lower and pat.search(text_lower):
+            found.append(a)
+            if len(found) == 3:
+                break
+    return tuple(found)
+
+
+# =====================================================
+# Rule patterns
+# =====================================================
+# headings (matched against lowercased headings)
+_HEAD_COMPARISON = _any_of(r"\bcomparison\b", r"\bvs\b", r"other .*neighbou?rhood")
+_HEAD_CONNECTIVITY = _any_of(r"connect", r"location", r"getting around", r"transport")
+_HEAD_CONNECTIVITY_EXPANDED = _any_of(r"connect", r"getting around", r"transport", r"metro", r"road")
+_HEAD_PREFER_DESPITE_CONS = _any_of(r"why .*prefer", r"despite", r"still choose", r"who .*suit")
+_HEAD_FINAL_THOUGHTS = _any_of(r"final thoughts", r"in summary", r"wrap up")
+_HEAD_CONCLUSION = _any_of(r"\bconclusion\b", r"in conclusion")
+_HEAD_PROS = _any_of(r"\bpros\b", r"advantages", r"benefits")
+_HEAD_CONS = _any_of(r"\bcons\b", r"disadvantages", r"drawbacks")
+_HEAD_FAQ = _any_of(r"\bfaq\b", r"frequently asked")
+
+# page-text keywords (whole words/phrases, counted in lowercased text)
+_KW_COMPARISON = ("comparison", "vs", "versus")
+_KW_CONNECTIVITY = ("metro", "road", "roads", "highway", "access", "connectivity", "commute")
+_KW_EXTRAS_PROS = ("michelin", "nightlife", "fine dining", "restaurants", "networking", "lifestyle")
+_KW_PREFER_DESPITE_CONS = ("despite", "still choose", "worth it", "suits", "who should")
+_KW_PROS = ("pros", "advantages", "benefits")
+_KW_CONS = ("cons", "disadvantages", "drawbacks", "traffic", "congestion", "high cost", "crowded", "green space")
+_KW_FAQ_TOPICS = ("cost of living", "schools", "safety", "market")
+
+# Every keyword above in one zero-width scan: the lookahead lets overlapping
+# phrases (e.g. "high cost" / "cost of living") each be counted, like separate scans would.
+_ALL_KEYWORDS = sorted(
+    {k for kws in (_KW_COMPARISON, _KW_CONNECTIVITY, _KW_EXTRAS_PROS, _KW_PREFER_DESPITE_CONS,
+                   _KW_PROS, _KW_CONS, _KW_FAQ_TOPICS) for k in kws},
+    key=lambda k: (-len(k), k),
+)
+_KEYWORD_SCAN_RE = re.compile(r"(?=\b(" + "|".join(re.escape(k) for k in _ALL_KEYWORDS) + r")\b)")
 
 
 # =====================================================
@@ -152,61 +332,61 @@ def _extract_area_mentions(text: str) -> List[str]:
 # =====================================================
 def _competitor_has_comparison(comp: Dict[str, Any]) -> bool:
     # heading strongly indicates comparison
-    if _has_heading_like(comp["headings"], [r"\bcomparison\b", r"\bvs\b", r"other .*neighbou?rhood"]):
+    if _has_heading_like(comp["headings_lower"], _HEAD_COMPARISON):
         return True
     # text indicates comparison + mentions multiple areas
-    areas = _extract_area_mentions(comp["text"])
-    if len(areas) >= 1 and _count_keywords(comp["text"], ["comparison", "vs", "versus"]) >= 1:
+    areas = _extract_area_mentions(comp["text_lower"])
+    if len(areas) >= 1 and _count_keywords(comp, _KW_COMPARISON) >= 1:
         return True
     return False
 
 
 def _bayut_has_comparison(bayut: Dict[str, Any]) -> bool:
     # Bayut should have a dedicated comparison heading to count as "covered"
-    return _has_heading_like(bayut["headings"], [r"\bcomparison\b", r"\bvs\b", r"other .*neighbou?rhood"])
+    return _has_heading_like(bayut["headings_lower"], _HEAD_COMPARISON)
 
 
 def _competitor_has_connectivity(comp: Dict[str, Any]) -> bool:
     return (
-        _has_heading_like(comp["headings"], [r"connect", r"location", r"getting around", r"transport"])
-        or _count_keywords(comp["text"], ["metro", "road", "roads", "highway", "access", "connectivity", "commute"]) >= 4
+        _has_heading_like(comp["headings_lower"], _HEAD_CONNECTIVITY)
+        or _count_keywords(comp, _KW_CONNECTIVITY) >= 4
     )
 
 
 def _bayut_has_connectivity_expanded(bayut: Dict[str, Any]) -> bool:
     # needs a transport/connectivity focused heading, not incidental "located in"
-    return _has_heading_like(bayut["headings"], [r"connect", r"getting around", r"transport", r"metro", r"road"])
+    return _has_heading_like(bayut["headings_lower"], _HEAD_CONNECTIVITY_EXPANDED)
 
 
 def _competitor_has_extras_within_pros(comp: Dict[str, Any]) -> bool:
-    return _count_keywords(comp["text"], ["michelin", "nightlife", "fine dining", "restaurants", "networking", "lifestyle"]) >= 3
+    return _count_keywords(comp, _KW_EXTRAS_PROS) >= 3
 
 
 def _competitor_has_prefer_despite_cons(comp: Dict[str, Any]) -> bool:
     return (
-        _has_heading_like(comp["headings"], [r"why .*prefer", r"despite", r"still choose", r"who .*suit"])
-        or _count_keywords(comp["text"], ["despite", "still choose", "worth it", "suits", "who should"]) >= 3
+        _has_heading_like(comp["headings_lower"], _HEAD_PREFER_DESPITE_CONS)
+        or _count_keywords(comp, _KW_PREFER_DESPITE_CONS) >= 3
     )
 
 
 def _competitor_has_final_thoughts(comp: Dict[str, Any]) -> bool:
-    return _has_heading_like(comp["headings"], [r"final thoughts", r"in summary", r"wrap up"])
+    return _has_heading_like(comp["headings_lower"], _HEAD_FINAL_THOUGHTS)
 
 
 def _competitor_has_conclusion(comp: Dict[str, Any]) -> bool:
-    return _has_heading_like(comp["headings"], [r"\bconclusion\b", r"in conclusion"])
+    return _has_heading_like(comp["headings_lower"], _HEAD_CONCLUSION)
 
 
 def _competitor_has_detailed_pros(comp: Dict[str, Any]) -> bool:
     # must be more than just one "pros" mention: look for structured pros sections or dense pros language
-    pros_heading = _has_heading_like(comp["headings"], [r"\bpros\b", r"advantages", r"benefits"])
-    pros_density = _count_keywords(comp["text"], ["pros", "advantages", "benefits"]) >= 6
+    pros_heading = _has_heading_like(comp["headings_lower"], _HEAD_PROS)
+    pros_density = _count_keywords(comp, _KW_PROS) >= 6
     return pros_heading and pros_density
 
 
 def _competitor_has_detailed_cons(comp: Dict[str, Any]) -> bool:
-    cons_heading = _has_heading_like(comp["headings"], [r"\bcons\b", r"disadvantages", r"drawbacks"])
-    cons_density = _count_keywords(comp["text"], ["cons", "disadvantages", "drawbacks", "traffic", "congestion", "high cost", "crowded", "green space"]) >= 6
+    cons_heading = _has_heading_like(comp["headings_lower"], _HEAD_CONS)
+    cons_density = _count_keywords(comp, _KW_CONS) >= 6
     return cons_heading and cons_density
 
 
@@ -214,125 +394,121 @@ def _competitor_has_faqs(comp: Dict[str, Any]) -> bool:
     if comp["faq_questions"]:
         return True
     # fallback: explicit FAQ heading or many question marks + common FAQ topics
-    if _has_heading_like(comp["headings"], [r"\bfaq\b", r"frequently asked"]):
+    if _has_heading_like(comp["headings_lower"], _HEAD_FAQ):
         return True
-    qmarks = comp["text"].count("?")
-    topic_hits = _count_keywords(comp["text"], ["cost of living", "schools", "safety", "market"])
+    qmarks = comp["question_marks"]
+    topic_hits = _count_keywords(comp, _KW_FAQ_TOPICS)
     return (qmarks >= 3 and topic_hits >= 1)
 
 
 def _bayut_has_faqs(bayut: Dict[str, Any]) -> bool:
-    return bool(bayut["faq_questions"]) or _has_heading_like(bayut["headings"], [r"\bfaq\b", r"frequently asked"])
+    return bool(bayut["faq_questions"]) or _has_heading_like(bayut["headings_lower"], _HEAD_FAQ)
+
+
+# =====================================================
+# Row table: (missing header, competitor predicate, Bayut signal that covers it, description)
+# description is a fixed string or a callable(comp, bayut_signals) for rows whose wording varies
+# =====================================================
+_DESC_COMPARISON = "Comparison between the area and nearby neighborhoods, highlighting differences in price, community feel, and suitability."
+_DESC_CONNECTIVITY = "Competitor explains more specific transport links and connectivity benefits (metro/roads/access) beyond a basic location overview."
+_DESC_EXTRAS_PROS = "Lists lifestyle-driven advantages (e.g., dining, nightlife, networking, modern urban appeal) that are not covered on Bayut."
+_DESC_PREFER_DESPITE_CONS = "Explains why some residents still choose the area despite the downsides, focusing on trade-offs and who it suits."
+_DESC_FINAL_THOUGHTS = "A final summarizing block weighing pros & cons and describing suitability for different resident types."
+_DESC_CONCLUSION = "A concluding wrap-up that helps readers decide if the area fits their needs."
+_DESC_DETAILED_PROS = "Competitor breaks pros into clearer themes (location, amenities, community, transportation, family infrastructure) beyond Bayut’s coverage."
+_DESC_DETAILED_CONS = "Explicit breakdown of cons such as traffic, cost, crowding, and limited green spaces that Bayut does not cover in the same depth."
+_DESC_FAQS_MISSING = "Competitor includes FAQs around cost of living, schools, safety, and the local market that Bayut does not address as FAQs."
+_DESC_FAQS_EXTRA = "Competitor covers additional FAQ topics (e.g., cost of living, schools, safety, market) that are missing from Bayut’s FAQ coverage."
+
+
+def _desc_comparison(comp: Dict[str, Any], bayut_signals: Dict[str, bool]) -> str:
+    areas = _extract_area_mentions(comp["text_lower"])
+    if areas:
+        return f"Comparison between the area and nearby neighborhoods such as {', '.join(areas)}, highlighting differences in price, community feel, and suitability."
+    return _DESC_COMPARISON
+
+
+def _desc_faqs(comp: Dict[str, Any], bayut_signals: Dict[str, bool]) -> str:
+    # ONE row either way; Bayut having FAQs only changes the wording (no explosion)
+    return _DESC_FAQS_EXTRA if bayut_signals["faqs"] else _DESC_FAQS_MISSING
+
+
+_RULES = (
+    ("Comparison with Other Dubai Neighborhoods", _competitor_has_comparison, "comparison", _desc_comparison),
+    ("Location & Connectivity (expanded)", _competitor_has_connectivity, "connectivity", _DESC_CONNECTIVITY),
+    ("Extras within Pros", _competitor_has_extras_within_pros, None, _DESC_EXTRAS_PROS),
+    ("Additional Reasons Some Prefer the Area", _competitor_has_prefer_despite_cons, None, _DESC_PREFER_DESPITE_CONS),
+    ("Final Thoughts", _competitor_has_final_thoughts, None, _DESC_FINAL_THOUGHTS),
+    ("Conclusion Summary", _competitor_has_conclusion, None, _DESC_CONCLUSION),
+    ("Detailed “Pros” sub-sections", _competitor_has_detailed_pros, None, _DESC_DETAILED_PROS),
+    ("Detailed “Cons” sub-sections", _competitor_has_detailed_cons, None, _DESC_DETAILED_CONS),
+    ("FAQs (missing questions)", _competitor_has_faqs, None, _desc_faqs),
+)
 
 
 # =====================================================
 # PUBLIC: analyze_article (what app.py calls)
 # =====================================================
 def analyze_article(bayut_url: str, competitor_urls: List[str]) -> Dict[str, Any]:
-    bayut = _parse_page(bayut_url)
+    urls = competitor_urls[:MAX_COMPETITORS]
+
+    # resubmitting the same form returns the earlier result (a copy, so callers can't alter the cache)
+    key = (_page_key(bayut_url), tuple(_page_key(u) for u in urls))
+    with _CACHE_LOCK:
+        cached = _RESULT_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < FETCH_CACHE_TTL_SECONDS:
+        result = copy.deepcopy(cached[1])
+        # the key is normalized -> report the URLs exactly as this call spelled them
+        result["bayut_url"] = bayut_url
+        for item, url in zip(result["results"], urls):
+            item["url"] = url
+        return result
+
+    # fetch + parse Bayut and every competitor concurrently; rows are built in order afterwards
+    # a page listed twice (or the Bayut URL repeated as a competitor) is fetched once
+    unique = {}
+    for u in [bayut_url, *urls]:
+        unique.setdefault(_page_key(u), u)
+
+    with ThreadPoolExecutor(max_workers=len(unique)) as ex:
+        futures = {key: ex.submit(_parse_page, u) for key, u in unique.items()}
+        bayut = futures[_page_key(bayut_url)].result()
+        comps = [futures[_page_key(u)].result() for u in urls]
+
+    # Bayut-side signals don't depend on the competitor -> evaluate once
+    bayut_signals = {
+        "comparison": _bayut_has_comparison(bayut),
+        "connectivity": _bayut_has_connectivity_expanded(bayut),
+        "faqs": _bayut_has_faqs(bayut),
+    }
 
     out_results = []
-    for url in competitor_urls[:5]:
-        comp = _parse_page(url)
+    for url, comp in zip(urls, comps):
         source = comp["source"]
 
+        # each rule appends at most one row with its own fixed header -> no de-dup pass needed
         rows: List[Dict[str, str]] = []
-
-        # --- Comparison
-        if _competitor_has_comparison(comp) and not _bayut_has_comparison(bayut):
-            areas = _extract_area_mentions(comp["text"])
-            if areas:
-                desc = f"Comparison between the area and nearby neighborhoods such as {', '.join(areas)}, highlighting differences in price, community feel, and suitability."
-            else:
-                desc = "Comparison between the area and nearby neighborhoods, highlighting differences in price, community feel, and suitability."
-            rows.append({"Missing header": "Comparison with Other Dubai Neighborhoods", "What the header contains": desc, "Source": source})
-
-        # --- Connectivity expanded
-        if _competitor_has_connectivity(comp) and not _bayut_has_connectivity_expanded(bayut):
-            rows.append({
-                "Missing header": "Location & Connectivity (expanded)",
-                "What the header contains": "Competitor explains more specific transport links and connectivity benefits (metro/roads/access) beyond a basic location overview.",
-                "Source": source
-            })
-
-        # --- Extras within Pros
-        if _competitor_has_extras_within_pros(comp):
-            rows.append({
-                "Missing header": "Extras within Pros",
-                "What the header contains": "Lists lifestyle-driven advantages (e.g., dining, nightlife, networking, modern urban appeal) that are not covered on Bayut.",
-                "Source": source
-            })
-
-        # --- Additional Reasons Some Prefer (despite cons)
-        if _competitor_has_prefer_despite_cons(comp):
-            rows.append({
-                "Missing header": "Additional Reasons Some Prefer the Area",
-                "What the header contains": "Explains why some residents still choose the area despite the downsides, focusing on trade-offs and who it suits.",
-                "Source": source
-            })
-
-        # --- Final Thoughts / Conclusion split (like your examples)
-        if _competitor_has_final_thoughts(comp):
-            rows.append({
-                "Missing header": "Final Thoughts",
-                "What the header contains": "A final summarizing block weighing pros & cons and describing suitability for different resident types.",
-                "Source": source
-            })
-
-        if _competitor_has_conclusion(comp):
-            rows.append({
-                "Missing header": "Conclusion Summary",
-                "What the header contains": "A concluding wrap-up that helps readers decide if the area fits their needs.",
-                "Source": source
-            })
-
-        # --- Detailed Pros / Cons
-        if _competitor_has_detailed_pros(comp):
-            rows.append({
-                "Missing header": "Detailed “Pros” sub-sections",
-                "What the header contains": "Competitor breaks pros into clearer themes (location, amenities, community, transportation, family infrastructure) beyond Bayut’s coverage.",
-                "Source": source
-            })
-
-        if _competitor_has_detailed_cons(comp):
+        for header, competitor_has, covered_by, desc in _RULES:
+            if covered_by and bayut_signals[covered_by]:
+                continue
+            if not competitor_has(comp):
+                continue
             rows.append({
-                "Missing header": "Detailed “Cons” sub-sections",
-                "What the header contains": "Explicit breakdown of cons such as traffic, cost, crowding, and limited green spaces that Bayut does not cover in the same depth.",
+                "Missing header": header,
+                "What the header contains": desc if isinstance(desc, str) else desc(comp, bayut_signals),
                 "Source": source
             })
 
-        # --- FAQs (ONE row only)
-        if _competitor_has_faqs(comp):
-            if not _bayut_has_faqs(bayut):
-                rows.append({
-                    "Missing header": "FAQs (missing questions)",
-                    "What the header contains": "Competitor includes FAQs around cost of living, schools, safety, and the local market that Bayut does not address as FAQs.",
-                    "Source": source
-                })
-            else:
-                # Bayut has FAQs, but competitor may have extra topics -> still keep ONE row (no explosion)
-                rows.append({
-                    "Missing header": "FAQs (missing questions)",
-                    "What the header contains": "Competitor covers additional FAQ topics (e.g., cost of living, schools, safety, market) that are missing from Bayut’s FAQ coverage.",
-                    "Source": source
-                })
-
-        # de-dup by Missing header (keep first)
-        seen = set()
-        deduped = []
-        for r in rows:
-            k = r["Missing header"].strip().lower()
-            if k in seen:
-                continue
-            seen.add(k)
-            deduped.append(r)
-
         out_results.append({
             "competitor": source,
             "url": url,
-            "rows": deduped
+            "rows": rows
         })
 
-        time.sleep(0.35)
-
-    return {"bayut_url": bayut_url, "results": out_results}
+    result = {"bayut_url": bayut_url, "results": out_results}
+    with _CACHE_LOCK:
+        _RESULT_CACHE.pop(key, None)
+        if len(_RESULT_CACHE) >= _RESULT_CACHE_MAX:
+            _RESULT_CACHE.pop(next(iter(_RESULT_CACHE)), None)
+        _RESULT_CACHE[key] = (time.monotonic(), result)
+    return copy.deepcopy(result)
@@ -19,10 +19,22 @@ def media_flags(page: Dict[str, Any]) -> Dict[str, Any]:
 
 def media_comparison(bayut: Dict[str, Any], competitors: List[Dict[str, Any]]) -> List[Dict[str, str]]:
     bay = media_flags(bayut)
+    bay_map, bay_videos, bay_images, bay_tables = bay["map"], bay["videos"], bay["images"], bay["tables"]
 
     rows = []
     for c in competitors:
         m = media_flags(c)
+
+        has = []
+        if m["map"] and not bay_map:
+            has.append("Map")
+        if m["videos"] > 0 and bay_videos == 0:
+            has.append("Video")
+        if m["images"] > bay_images:
+            has.append("More images")
+        if m["tables"] > 0 and bay_tables == 0:
+            has.append("Tables")
+
         rows.append({
             "Competitor": c.get("url", ""),
             "Images": str(m["images"]),
@@ -30,11 +42,6 @@ def media_comparison(bayut: Dict[str, Any], competitors: List[Dict[str, Any]]) -
             "Map": "Yes" if m["map"] else "No",
             "Tables": str(m["tables"]),
             "OG image": "Yes" if m["og_image"] else "No",
-            "What competitor has (vs Bayut)": ", ".join([
-                "Map" if (m["map"] and not bay["map"]) else "",
-                "Video" if (m["videos"] > 0 and bay["videos"] == 0) else "",
-                "More images" if (m["images"] > bay["images"]) else "",
-                "Tables" if (m["tables"] > 0 and bay["tables"] == 0) else "",
-            ]).replace(",,", ",").strip(" ,")
+            "What competitor has (vs Bayut)": ", ".join(has),
         })
     return rows
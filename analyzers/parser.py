@@ -1,9 +1,14 @@
+import copy
+import hashlib
 import re
-import json
+import threading
+from functools import lru_cache
+from itertools import chain
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+import lxml.html
+import orjson
+from lxml import etree
 
 
 _STOP = {
@@ -15,19 +20,44 @@ _STOP = {
 
 _IGNORE_TAGS = {"nav", "footer", "header", "aside", "form", "noscript", "script", "style"}
 
+_RE_PUNCT = re.compile(r"[\|\-\—\–•·•]+")
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9\s\?\&\(\)\:\/]")
+_RE_QUESTION = re.compile(r"([A-Z][^?]{10,120}\?)")
+# ASCII-only case folding gives the same matches as lowering the text first:
+# no non-ASCII character lowercases into part of either phrase
+_RE_MAP_TEXT = re.compile(r"view on map|google map", re.IGNORECASE | re.ASCII)
+_RE_WORD = re.compile(r"\w+")  # a maximal \w+ run is already bounded by \b on both sides
+
+# visible text only: script/style/template bodies are code, not content
+_META_XPATH = etree.XPath("//meta[@name or @property]")
+_TEXT_XPATH = etree.XPath(
+    ".//text()[not(ancestor::script or ancestor::style or ancestor::template)]",
+    smart_strings=False,
+)
+
 
 def _clean_text(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "")).strip()
+    # split()/join run in C and treat exactly the characters \s matches as whitespace;
+    # same result as re.sub(r"\s+", " ", s).strip() without the regex engine
+    return " ".join((s or "").split())
 
 
 def _norm_heading(s: str) -> str:
     s = _clean_text(s).lower()
-    s = re.sub(r"[\|\-\—\–•·•]+", " ", s)
-    s = re.sub(r"[^a-z0-9\s\?\&\(\)\:\/]", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    s = _RE_PUNCT.sub(" ", s)
+    s = _RE_NON_ALNUM.sub("", s)
+    return " ".join(s.split())
+
+
+# host substring -> display name, checked in order
+_KNOWN_HOSTS = (
+    ("drivenproperties", "Driven Properties"),
+    ("dubizzle", "Dubizzle"),
+    ("emaar", "Emaar"),
+)
 
 
+@lru_cache(maxsize=512)
 def _competitor_name_from_url(url: str) -> str:
     try:
         host = urlparse(url).netloc.lower()
@@ -35,249 +65,392 @@ def _competitor_name_from_url(url: str) -> str:
         host = ""
     host = host.replace("www.", "")
 
-    if "drivenproperties" in host:
-        return "Driven Properties"
-    if "dubizzle" in host:
-        return "Dubizzle"
-    if "emaar" in host:
-        return "Emaar"
+    for needle, name in _KNOWN_HOSTS:
+        if needle in host:
+            return name
     if not host:
         return "Competitor"
     return host.split(":")[0]
 
 
-def _get_main_container(soup: BeautifulSoup):
-    main = soup.find("main")
-    if main:
-        return main
-    article = soup.find("article")
-    if article:
-        return article
-    body = soup.body
-    return body if body else soup
-
+def _get_text(el) -> str:
+    # same contract as bs4 get_text(" ", strip=True)
+    return " ".join(t for t in (x.strip() for x in _TEXT_XPATH(el)) if t)
 
-def _safe_attrs(tag: Tag) -> dict:
-    # bs4 can produce tags with attrs=None → always normalize to dict
-    a = getattr(tag, "attrs", None)
-    return a if isinstance(a, dict) else {}
 
-
-def _safe_class_id(tag: Tag) -> str:
-    a = _safe_attrs(tag)
-
-    cls = a.get("class") or []
-    if isinstance(cls, str):
-        cls = [cls]
-
-    tid = a.get("id") or ""
-    return (" ".join(cls) + " " + tid).strip().lower()
+def parse_document(html: str):
+    """
+    Builds the lxml document for an HTML string; also used by gaps for its own page walk.
+    """
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # str input with an XML encoding declaration -> hand lxml the bytes instead
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        # empty / whitespace-only document
+        return lxml.html.document_fromstring("<html><body></body></html>")
+
+
+def _get_main_container(root):
+    main = root.find(".//main")
+    if main is not None:
+        return main
+    article = root.find(".//article")
+    if article is not None:
+        return article
+    body = root.find("body")
+    return body if body is not None else root
+
+
+def _drop(el) -> None:
+    # drop_tree keeps the tail text; pad it so it doesn't fuse with the text before the removed block
+    if el.tail:
+        el.tail = " " + el.tail
+    el.drop_tree()
+
+
+def _class_id(el) -> str:
+    cls = el.get("class")
+    eid = el.get("id")
+    if not cls and not eid:
+        # most elements carry neither -> no string building
+        return ""
+    return ((cls or "") + " " + (eid or "")).strip().lower()
+
+
+# parse results keyed by (HTML digest, page_url, mode); oldest entry evicted first
+_PARSE_CACHE = {}
+_PARSE_CACHE_MAX = 64
+# parse_html may run on several threads at once; eviction must not race
+_PARSE_CACHE_LOCK = threading.Lock()
+
+_NOISE_TAGS = {"header", "footer", "nav", "aside", "form"}
+
+_BAD_WORDS = (
+    "cookie", "consent", "gdpr", "subscribe", "newsletter", "signup",
+    "modal", "popup", "banner", "breadcrumbs", "breadcrumb",
+    "share", "social", "comment", "comments", "related", "recommend",
+    "sidebar", "sticky", "nav", "menu", "footer", "header", "promo",
+    "ads", "advert", "advertisement", "sponsored"
+)
+# one C-level scan per class/id string instead of a substring test per word
+_BAD_RE = re.compile("|".join(map(re.escape, sorted(set(_BAD_WORDS), key=len, reverse=True))))
+
+_SECTION_BLOCK_TAGS = frozenset(("p", "li", "ul", "ol", "div", "span"))
+# heading tag -> lowest open section level it closes
+_CLOSES_LEVEL = {"h2": 2, "h3": 3, "h4": 4}
+
+# content elements collected while the container is scanned: tag -> bucket
+# (h2-h4 share one bucket so sections keep document order)
+_BUCKET_OF = {
+    "h2": "headings", "h3": "headings", "h4": "headings",
+    "img": "img", "iframe": "iframe", "table": "table", "video": "video",
+}
 
 
-def _strip_layout_noise(container):
-    if not container:
-        return
+def _strip_layout_noise(container) -> dict:
+    """
+    Single walk over the container: drops layout noise (structural tags and
+    elements whose class/id looks like chrome) and, in the same pass, buckets
+    the surviving content elements by tag in document order.
+    """
+    buckets = {b: [] for b in set(_BUCKET_OF.values())}
+    if container is None:
+        return buckets
+
+    noise = []
+    walker = etree.iterwalk(container, events=("start",))
+    for _, el in walker:
+        if el is container:
+            continue
 
-    # remove obvious non-content blocks
-    for x in container.find_all(["header", "footer", "nav", "aside", "form"]):
-        x.decompose()
+        # structural tags first; class/id are only read for the rest
+        if el.tag in _NOISE_TAGS or _BAD_RE.search(_class_id(el)):
+            # nothing under a noise block is kept -> don't descend into it
+            noise.append(el)
+            walker.skip_subtree()
+            continue
 
-    bad_words = (
-        "cookie", "consent", "gdpr", "subscribe", "newsletter", "signup",
-        "modal", "popup", "banner", "breadcrumbs", "breadcrumb",
-        "share", "social", "comment", "comments", "related", "recommend",
-        "sidebar", "sticky", "nav", "menu", "footer", "header", "promo",
-        "ads", "advert", "advertisement", "sponsored"
-    )
+        b = _BUCKET_OF.get(el.tag)
+        if b is not None:
+            buckets[b].append(el)
 
-    # IMPORTANT: never call t.get(...) here (that caused your crash)
-    for t in container.find_all(True):
-        if not isinstance(t, Tag):
-            continue
+    for el in noise:
+        _drop(el)
 
-        cid = _safe_class_id(t)
-        if cid and any(w in cid for w in bad_words):
-            t.decompose()
+    return buckets
 
 
-def _extract_schema_types(soup: BeautifulSoup):
+def _extract_schema_types(root):
     schema_types = []
-    for s in soup.find_all("script", type="application/ld+json"):
-        raw = (s.string or "").strip()
-        if not raw:
+    seen = set()
+    for s in root.iterfind('.//script[@type="application/ld+json"]'):
+        raw = (s.text or "").strip()
+        # blocks without an @type key contribute nothing -> don't decode them
+        if not raw or '"@type"' not in raw:
             continue
         try:
-            data = json.loads(raw)
+            data = orjson.loads(raw)
             items = data if isinstance(data, list) else [data]
             for item in items:
                 if isinstance(item, dict):
                     t = item.get("@type")
-                    if isinstance(t, list):
-                        schema_types.extend([str(x) for x in t if x])
-                    elif t:
-                        schema_types.append(str(t))
+                    for x in (t if isinstance(t, list) else (t,)):
+                        if not x:
+                            continue
+                        # de-dup while walking, first occurrence keeps its position
+                        name = str(x)
+                        if name not in seen:
+                            seen.add(name)
+                            schema_types.append(name)
         except Exception:
             continue
 
-    return list(dict.fromkeys(schema_types))
+    return schema_types
 
 
-def _has_map(container: BeautifulSoup) -> bool:
-    for iframe in container.find_all("iframe"):
-        # iframe.get can also crash if attrs=None → use safe attrs
-        if not isinstance(iframe, Tag):
-            continue
-        src = (_safe_attrs(iframe).get("src") or "").lower()
+def _scan_iframes(iframes):
+    # one pass over the iframes for both video embeds and map embeds
+    video_iframes = 0
+    map_iframe = False
+    for iframe in iframes:
+        src = (iframe.get("src") or "").lower()
+        if "youtube.com" in src or "youtu.be" in src or "vimeo.com" in src:
+            video_iframes += 1
         if "google.com/maps" in src or "mapbox" in src or "maps/embed" in src or "embed?pb=" in src:
-            return True
+            map_iframe = True
+    return video_iframes, map_iframe
+
+
+def _has_map(map_iframe: bool, container_text: str) -> bool:
+    if map_iframe:
+        return True
 
-    txt = container.get_text(" ", strip=True).lower()
-    return ("view on map" in txt) or ("google map" in txt)
+    # case-insensitive probe without a lowered copy of the whole page text
+    return _RE_MAP_TEXT.search(container_text) is not None
 
 
-def _count_media(container: BeautifulSoup) -> dict:
+def _count_media(buckets: dict, video_iframes: int) -> dict:
     imgs = 0
-    for i in container.find_all("img"):
-        if not isinstance(i, Tag):
-            continue
-        src = _safe_attrs(i).get("src") or ""
+    for i in buckets["img"]:
+        src = i.get("src") or ""
         if src.strip():
             imgs += 1
 
-    table_count = len(container.find_all("table"))
-
-    video_count = len(container.find_all("video"))
-    for iframe in container.find_all("iframe"):
-        if not isinstance(iframe, Tag):
-            continue
-        src = (_safe_attrs(iframe).get("src") or "").lower()
-        if "youtube.com" in src or "youtu.be" in src or "vimeo.com" in src:
-            video_count += 1
+    table_count = len(buckets["table"])
+    video_count = len(buckets["video"]) + video_iframes
 
     return {"image_count": imgs, "video_count": video_count, "table_count": table_count}
 
 
-def _build_headings_and_sections(container: BeautifulSoup):
+def _build_headings_and_sections(nodes, with_sections: bool = True):
     headings = []
     section_texts = {}
+    faq_questions = {}  # insertion-ordered set: question -> None
 
-    nodes = container.find_all(["h2", "h3", "h4"])
+    titled = []
     for n in nodes:
-        level = int(n.name[1])
-        txt = _clean_text(n.get_text(" ", strip=True))
+        level = int(n.tag[1])
+        txt = _clean_text(_get_text(n))
         if txt:
             headings.append({"level": level, "text": txt})
-
-    for n in nodes:
-        level = int(n.name[1])
-        title = _clean_text(n.get_text(" ", strip=True))
-        if not title:
-            continue
-
-        if level == 2:
-            stop_levels = {"h2"}
-        elif level == 3:
-            stop_levels = {"h2", "h3"}
-        else:
-            stop_levels = {"h2", "h3", "h4"}
-
-        chunks = []
-        cur = n.next_sibling
-        while cur is not None:
-            name = getattr(cur, "name", None)
-            if name in stop_levels:
+            titled.append((n, level, txt))
+            # fallback: headings that look like questions
+            if "?" in txt and len(txt) <= 140:
+                faq_questions.setdefault(txt)
+
+    if not with_sections:
+        return headings, section_texts, faq_questions
+
+    # A section is the heading's following siblings up to the next heading that closes it
+    # (h2 closes everything, h3 closes h3/h4, h4 is closed by any heading), capped at 20 blocks.
+    # Walk each heading parent's children at most once, feeding every block to all open sections,
+    # instead of re-walking the siblings from every heading.
+    chunks_of = {}
+    for n, level, title in titled:
+        chunks_of[n] = []
+
+    heads_by_parent = {}
+    for n, _, _ in titled:
+        heads_by_parent.setdefault(n.getparent(), []).append(n)
+
+    for heads in heads_by_parent.values():
+        # start at the parent's first titled heading and stop once every section
+        # has closed (or hit its cap) and no titled heading is left to open one
+        remaining = len(heads)
+        open_sections = []  # (level, chunks) of sections still collecting
+        for cur in chain((heads[0],), heads[0].itersiblings()):
+            if not open_sections and not remaining:
                 break
 
-            if name in ["p", "li", "ul", "ol", "div", "span"]:
-                if hasattr(cur, "get_text"):
-                    txt = _clean_text(cur.get_text(" ", strip=True))
-                else:
-                    txt = _clean_text(str(cur))
-                if txt and len(txt) > 10:
-                    chunks.append(txt)
-
-            cur = cur.next_sibling
-
-            if len(chunks) >= 20:
-                break
-
-        section_texts[(level, title)] = _clean_text(" ".join(chunks))
-
-    return headings, section_texts
-
-
-def _extract_faq_questions(headings, section_texts, schema_types):
-    faq_titles = []
-    for h in headings:
-        t = (h.get("text") or "").lower()
+            name = cur.tag
+            closes = _CLOSES_LEVEL.get(name)
+            if closes is not None:
+                open_sections = [sec for sec in open_sections if sec[0] < closes]
+                chunks = chunks_of.get(cur)
+                if chunks is not None:
+                    remaining -= 1
+                    open_sections.append((int(name[1]), chunks))
+                continue
+
+            if open_sections and name in _SECTION_BLOCK_TAGS:
+                raw = _get_text(cur)
+                # cleaning never lengthens text -> short blocks are rejected before cleaning
+                if len(raw) <= 10:
+                    continue
+                txt = _clean_text(raw)
+                if len(txt) > 10:
+                    for _, chunks in open_sections:
+                        chunks.append(txt)
+                    open_sections = [sec for sec in open_sections if len(sec[1]) < 20]
+
+    for n, level, title in titled:
+        chunks = chunks_of[n]
+        # chunks are cleaned and non-empty, so joining them with single spaces keeps the blob clean
+        blob = " ".join(chunks)
+        section_texts[(level, title)] = blob
+
+        # FAQ sections: pull the questions while the section text is in hand
+        t = title.lower()
         if "faq" in t or "frequently asked" in t:
-            faq_titles.append((h["level"], h["text"]))
+            faq_questions.update(dict.fromkeys(_RE_QUESTION.findall(blob)))
 
-    questions = set()
+    return headings, section_texts, faq_questions
 
-    for (lvl, title) in faq_titles:
-        blob = section_texts.get((lvl, title), "")
-        for q in re.findall(r"([A-Z][^?]{10,120}\?)", blob):
-            questions.add(_clean_text(q))
 
-    # fallback: headings that look like questions
-    for h in headings:
-        txt = h.get("text") or ""
-        if "?" in txt and len(txt) <= 140:
-            questions.add(_clean_text(txt))
-
-    out = [q for q in questions if q]
-    out.sort()
-    return out
-
-
-def parse_html(html: str, page_url: str = "") -> dict:
-    soup = BeautifulSoup(html or "", "lxml")
-    title = soup.title.get_text(strip=True) if soup.title else ""
-
-    def meta(name: str) -> str:
-        tag = soup.find("meta", attrs={"name": name})
-        if not tag:
-            return ""
-        return (_safe_attrs(tag).get("content") or "").strip()
-
-    def meta_prop(prop: str) -> str:
-        tag = soup.find("meta", attrs={"property": prop})
-        if not tag:
-            return ""
-        return (_safe_attrs(tag).get("content") or "").strip()
+def _extract_faq_questions(faq_questions):
+    # unique, in the order they were found (question headings first, then FAQ section questions)
+    return [q for q in faq_questions if q]
 
-    container = _get_main_container(soup)
-    _strip_layout_noise(container)
 
-    headings, section_texts = _build_headings_and_sections(container)
+def _empty_result(page_url: str) -> dict:
+    # what parse_html returns for a page with no markup; fresh lists/dicts per call
+    return {
+        "page_url": page_url or "",
+        "competitor_name": _competitor_name_from_url(page_url or ""),
+        "title": "",
+        "meta_description": "",
+        "robots": "",
+        "viewport": "",
+        "og_title": "",
+        "og_description": "",
+        "og_image": "",
+        "h1": [],
+        "h2": [],
+        "h3": [],
+        "h4": [],
+        "headings": [],
+        "section_texts": {},
+        "faq_questions": [],
+        "word_count": 0,
+        "schema_types": [],
+        "schema_count": 0,
+        "has_map": False,
+        "image_count": 0,
+        "video_count": 0,
+        "table_count": 0,
+        "raw_text": "",
+    }
 
-    h1 = [_clean_text(h.get_text(" ", strip=True)) for h in soup.find_all("h1")]
-    h2 = [h["text"] for h in headings if h["level"] == 2]
-    h3 = [h["text"] for h in headings if h["level"] == 3]
-    h4 = [h["text"] for h in headings if h["level"] == 4]
 
-    raw_text = _clean_text(container.get_text(" ", strip=True))
-    word_count = len(re.findall(r"\b\w+\b", raw_text))
+def _cache_key(html: str, page_url: str, mode: str) -> tuple:
+    # a digest keeps the cache from holding on to every page's HTML
+    digest = hashlib.blake2b(html.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return digest, page_url or "", mode
+
+
+def _cache_store(key: tuple, result: dict) -> None:
+    with _PARSE_CACHE_LOCK:
+        if len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+            _PARSE_CACHE.pop(next(iter(_PARSE_CACHE)), None)
+        _PARSE_CACHE[key] = result
+
+
+def parse_html(html: str, page_url: str = "", mode: str = "full") -> dict:
+    """
+    mode="full" extracts everything. mode="lite" is for callers that only need
+    meta/headings/schema/media counts: it skips section texts, FAQ questions,
+    raw_text and word_count (returned empty), and the text-based map check.
+    Results are cached by HTML digest, so reruns on the same page skip the parse.
+    """
+    # empty / failed fetches: nothing to parse, skip building a document
+    if not html or html.isspace():
+        return _empty_result(page_url)
+
+    key = _cache_key(html, page_url, mode)
+    with _PARSE_CACHE_LOCK:
+        cached = _PARSE_CACHE.get(key)
+    if cached is None:
+        cached = _parse_html_uncached(html, page_url, mode)
+        _cache_store(key, cached)
+    # callers get their own copy; the cached dict is never handed out
+    return copy.deepcopy(cached)
+
+
+def _parse_html_uncached(html: str, page_url: str, mode: str) -> dict:
+
+    lite = mode == "lite"
+    root = parse_document(html)
+    title_el = root.find(".//title")
+    title = "".join(t.strip() for t in _TEXT_XPATH(title_el)) if title_el is not None else ""
+
+    # one XPath pass over the <meta> tags; the first tag per name/property wins, as with find()
+    meta_by_name = {}
+    meta_by_prop = {}
+    for tag in _META_XPATH(root):
+        content = (tag.get("content") or "").strip()
+        name = tag.get("name")
+        if name is not None:
+            meta_by_name.setdefault(name, content)
+        prop = tag.get("property")
+        if prop is not None:
+            meta_by_prop.setdefault(prop, content)
+
+    container = _get_main_container(root)
+    buckets = _strip_layout_noise(container)
+
+    headings, section_texts, faq_candidates = _build_headings_and_sections(
+        buckets["headings"], with_sections=not lite
+    )
 
-    schema_types = _extract_schema_types(soup)
+    h1 = [_clean_text(_get_text(h)) for h in root.iter("h1")]
+    # single pass over the headings already built, dispatched by level
+    by_level = {2: [], 3: [], 4: []}
+    for h in headings:
+        by_level[h["level"]].append(h["text"])
+    h2, h3, h4 = by_level[2], by_level[3], by_level[4]
+
+    if lite:
+        container_text = ""
+        raw_text = ""
+        word_count = 0
+    else:
+        # one text walk of the container feeds raw_text, word_count and the map check
+        container_text = _get_text(container)
+        raw_text = _clean_text(container_text)
+        # subn counts matches without materialising a list of every word on the page
+        word_count = _RE_WORD.subn("", raw_text)[1]
+
+    schema_types = _extract_schema_types(root)
     schema_count = len(schema_types)
 
-    media_counts = _count_media(container)
-    has_map = _has_map(container)
+    video_iframes, map_iframe = _scan_iframes(buckets["iframe"])
+    media_counts = _count_media(buckets, video_iframes)
+    has_map = _has_map(map_iframe, container_text)
 
-    faq_questions = _extract_faq_questions(headings, section_texts, schema_types)
+    faq_questions = [] if lite else _extract_faq_questions(faq_candidates)
 
     return {
         "page_url": page_url or "",
         "competitor_name": _competitor_name_from_url(page_url or ""),
         "title": title,
-        "meta_description": meta("description"),
-        "robots": meta("robots"),
-        "viewport": meta("viewport"),
-        "og_title": meta_prop("og:title"),
-        "og_description": meta_prop("og:description"),
-        "og_image": meta_prop("og:image"),
+        "meta_description": meta_by_name.get("description", ""),
+        "robots": meta_by_name.get("robots", ""),
+        "viewport": meta_by_name.get("viewport", ""),
+        "og_title": meta_by_prop.get("og:title", ""),
+        "og_description": meta_by_prop.get("og:description", ""),
+        "og_image": meta_by_prop.get("og:image", ""),
         "h1": [x for x in h1 if x],
         "h2": [x for x in h2 if x],
         "h3": [x for x in h3 if x],
@@ -1,5 +1,13 @@
+from urllib.parse import urlparse
+
 import streamlit as st
 
+# shared with analyze_article, so every listed competitor is actually analysed
+from analyzers.gaps import MAX_COMPETITORS
+
+# competitor URLs must use one of these schemes
+URL_SCHEMES = ("http", "https")
+
 # ==================================================
 # PAGE CONFIG
 # ==================================================
@@ -163,8 +171,9 @@ mode_clicked = st.markdown(
 )
 
 # Capture mode selection safely
-if st.experimental_get_query_params().get("mode"):
-    st.session_state.mode = st.experimental_get_query_params()["mode"][0]
+query_mode = st.experimental_get_query_params().get("mode")
+if query_mode:
+    st.session_state.mode = query_mode[0]
 
 
 # ==================================================
@@ -205,16 +214,29 @@ col1, col2 = st.columns([1, 3])
 
 with col1:
     if st.button("➕ Add"):
-        if new_competitor:
-            st.session_state.competitor_urls.append(new_competitor)
+        url = (new_competitor or "").strip()
+        if url:
+            parts = urlparse(url)
+            if parts.scheme not in URL_SCHEMES or not parts.netloc:
+                # rejected here so it never takes a fetch slot
+                st.warning("Enter a full URL starting with http:// or https://")
+            elif url in st.session_state.competitor_urls:
+                # the same page is only listed (and later fetched) once
+                st.info("Competitor already added")
+            elif len(st.session_state.competitor_urls) >= MAX_COMPETITORS:
+                st.warning(f"Up to {MAX_COMPETITORS} competitors can be compared")
+            else:
+                st.session_state.competitor_urls.append(url)
 
 with col2:
     if st.button("Clear"):
         st.session_state.competitor_urls = []
 
 if st.session_state.competitor_urls:
-    for i, url in enumerate(st.session_state.competitor_urls, start=1):
-        st.write(f"{i}. {url}")
+    # one markdown element for the whole list instead of one element per competitor
+    st.markdown("\n".join(
+        f"{i}. {url}" for i, url in enumerate(st.session_state.competitor_urls, start=1)
+    ))
 else:
     st.markdown("<p style='color:#9ca3af;'>No competitors added yet</p>", unsafe_allow_html=True)
 